@@ -52,8 +52,10 @@ class UDPServer(asyncio.DatagramProtocol):
             )
 
             while not self.context.terminated.is_set() or not self.protocol.idle:
-                event = await self.protocol_queue.get()
-                await self.protocol.handle(event)
+                events = [await self.protocol_queue.get()]
+                while not self.protocol_queue.empty():
+                    events.append(self.protocol_queue.get_nowait())
+                await self.protocol.handle_batch(events)
 
     async def protocol_send(self, event: Event) -> None:
         if isinstance(event, RawData):
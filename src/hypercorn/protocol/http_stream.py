@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from enum import auto, Enum
-from time import time
+from time import monotonic
 from typing import Awaitable, Callable, Optional, Tuple
 from urllib.parse import unquote
 
@@ -71,7 +71,7 @@ class HTTPStream:
         if self.closed:
             return
         elif isinstance(event, Request):
-            self.start_time = time()
+            self.start_time = monotonic()
             path, _, query_string = event.raw_path.partition(b"?")
             self.scope = {
                 "type": "http",
@@ -110,7 +110,7 @@ class HTTPStream:
             await self.app_put({"type": "http.request", "body": b"", "more_body": False})
         elif isinstance(event, StreamClosed):
             self.closed = True
-            await self.config.log.access(self.scope, None, time() - self.start_time)
+            await self.config.log.access(self.scope, None, monotonic() - self.start_time)
             if self.app_put is not None:
                 await self.app_put({"type": "http.disconnect"})
 
@@ -184,7 +184,7 @@ class HTTPStream:
                     if self.state != ASGIHTTPState.CLOSED:
                         self.state = ASGIHTTPState.CLOSED
                         await self.config.log.access(
-                            self.scope, self.response, time() - self.start_time
+                            self.scope, self.response, monotonic() - self.start_time
                         )
                         await self.send(EndBody(stream_id=self.stream_id))
                         await self.send(StreamClosed(stream_id=self.stream_id))
@@ -202,5 +202,5 @@ class HTTPStream:
         await self.send(EndBody(stream_id=self.stream_id))
         self.state = ASGIHTTPState.CLOSED
         await self.config.log.access(
-            self.scope, {"status": status_code, "headers": []}, time() - self.start_time
+            self.scope, {"status": status_code, "headers": []}, monotonic() - self.start_time
         )
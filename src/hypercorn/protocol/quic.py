@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from functools import partial
-from typing import Awaitable, Callable, Dict, Optional, Tuple
+from typing import Awaitable, Callable, Dict, Iterable, Optional, Tuple
 
 from aioquic.buffer import Buffer
 from aioquic.h3.connection import H3_ALPN
@@ -53,46 +53,59 @@ class QuicProtocol:
 
     async def handle(self, event: Event) -> None:
         if isinstance(event, RawData):
-            try:
-                header = pull_quic_header(Buffer(data=event.data), host_cid_length=8)
-            except ValueError:
-                return
-            if (
-                header.version is not None
-                and header.version not in self.quic_config.supported_versions
-            ):
-                data = encode_quic_version_negotiation(
-                    source_cid=header.destination_cid,
-                    destination_cid=header.source_cid,
-                    supported_versions=self.quic_config.supported_versions,
-                )
-                await self.send(RawData(data=data, address=event.address))
-                return
-
-            connection = self.connections.get(header.destination_cid)
-            if (
-                connection is None
-                and len(event.data) >= 1200
-                and header.packet_type == PACKET_TYPE_INITIAL
-                and not self.context.terminated.is_set()
-            ):
-                connection = QuicConnection(
-                    configuration=self.quic_config,
-                    original_destination_connection_id=header.destination_cid,
-                )
-                self.connections[header.destination_cid] = connection
-                self.connections[connection.host_cid] = connection
-
-            if connection is not None:
-                connection.receive_datagram(event.data, event.address, now=self.context.time())
-                await self._handle_events(connection, event.address)
+            await self.handle_batch([event])
         elif isinstance(event, Closed):
             pass
 
+    async def handle_batch(self, events: Iterable[RawData]) -> None:
+        # Process each connection once per batch, rather than per
+        # datagram, with the address of its last datagram in the batch
+        # passed on as the client.
+        connections: Dict[QuicConnection, Optional[Tuple[str, int]]] = {}
+        for event in events:
+            connection = await self._receive_datagram(event)
+            if connection is not None:
+                connections[connection] = event.address
+
+        for connection, address in connections.items():
+            await self._handle_events(connection, address)
+
     async def send_all(self, connection: QuicConnection) -> None:
         for data, address in connection.datagrams_to_send(now=self.context.time()):
             await self.send(RawData(data=data, address=address))
 
+    async def _receive_datagram(self, event: RawData) -> Optional[QuicConnection]:
+        try:
+            header = pull_quic_header(Buffer(data=event.data), host_cid_length=8)
+        except ValueError:
+            return None
+        if header.version is not None and header.version not in self.quic_config.supported_versions:
+            data = encode_quic_version_negotiation(
+                source_cid=header.destination_cid,
+                destination_cid=header.source_cid,
+                supported_versions=self.quic_config.supported_versions,
+            )
+            await self.send(RawData(data=data, address=event.address))
+            return None
+
+        connection = self.connections.get(header.destination_cid)
+        if (
+            connection is None
+            and len(event.data) >= 1200
+            and header.packet_type == PACKET_TYPE_INITIAL
+            and not self.context.terminated.is_set()
+        ):
+            connection = QuicConnection(
+                configuration=self.quic_config,
+                original_destination_connection_id=header.destination_cid,
+            )
+            self.connections[header.destination_cid] = connection
+            self.connections[connection.host_cid] = connection
+
+        if connection is not None:
+            connection.receive_datagram(event.data, event.address, now=self.context.time())
+        return connection
+
     async def _handle_events(
         self, connection: QuicConnection, client: Optional[Tuple[str, int]] = None
     ) -> None:
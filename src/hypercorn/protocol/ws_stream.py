@@ -2,8 +2,20 @@ from __future__ import annotations
 
 from enum import auto, Enum
 from io import BytesIO, StringIO
-from time import time
-from typing import Awaitable, Callable, Iterable, List, Optional, Tuple, Union
+from time import monotonic
+from typing import (
+    Awaitable,
+    Callable,
+    cast,
+    ClassVar,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+)
 from urllib.parse import unquote
 
 from wsproto.connection import Connection, ConnectionState, ConnectionType
@@ -25,11 +37,14 @@ from ..config import Config
 from ..typing import (
     AppWrapper,
     ASGISendEvent,
+    ResponseSummary,
     TaskGroup,
     WebsocketAcceptEvent,
+    WebsocketCloseEvent,
     WebsocketResponseBodyEvent,
     WebsocketResponseStartEvent,
     WebsocketScope,
+    WebsocketSendEvent,
     WorkerContext,
 )
 from ..utils import (
@@ -54,29 +69,36 @@ class FrameTooLargeError(Exception):
     pass
 
 
+_ERROR_HEADERS = ((b"content-length", b"0"), (b"connection", b"close"))
+_UPGRADE_HEADERS = ((b"upgrade", b"WebSocket"), (b"connection", b"Upgrade"))
+
+_HANDSHAKE_HEADERS: Dict[bytes, Tuple[str, Optional[Callable[[bytes], List[str]]]]] = {
+    b"connection": ("connection_tokens", split_comma_header),
+    b"sec-websocket-extensions": ("extensions", split_comma_header),
+    b"sec-websocket-key": ("key", None),
+    b"sec-websocket-protocol": ("subprotocols", split_comma_header),
+    b"sec-websocket-version": ("version", None),
+    b"upgrade": ("upgrade", None),
+}
+
+
 class Handshake:
+    # Defaults for headers absent from the request, set as class
+    # attributes so that only the headers present are stored per instance.
+    connection_tokens: Optional[List[str]] = None
+    extensions: Optional[List[str]] = None
+    key: Optional[bytes] = None
+    subprotocols: Optional[List[str]] = None
+    upgrade: Optional[bytes] = None
+    version: Optional[bytes] = None
+
     def __init__(self, headers: List[Tuple[bytes, bytes]], http_version: str) -> None:
         self.http_version = http_version
-        self.connection_tokens: Optional[List[str]] = None
-        self.extensions: Optional[List[str]] = None
-        self.key: Optional[bytes] = None
-        self.subprotocols: Optional[List[str]] = None
-        self.upgrade: Optional[bytes] = None
-        self.version: Optional[bytes] = None
         for name, value in headers:
-            name = name.lower()
-            if name == b"connection":
-                self.connection_tokens = split_comma_header(value)
-            elif name == b"sec-websocket-extensions":
-                self.extensions = split_comma_header(value)
-            elif name == b"sec-websocket-key":
-                self.key = value
-            elif name == b"sec-websocket-protocol":
-                self.subprotocols = split_comma_header(value)
-            elif name == b"sec-websocket-version":
-                self.version = value
-            elif name == b"upgrade":
-                self.upgrade = value
+            entry = _HANDSHAKE_HEADERS.get(name.lower())
+            if entry is not None:
+                attribute, parser = entry
+                setattr(self, attribute, value if parser is None else parser(value))
 
     def is_valid(self) -> bool:
         if self.http_version < "1.1":
@@ -84,9 +106,9 @@ class Handshake:
         elif self.http_version == "1.1":
             if self.key is None:
                 return False
-            if self.connection_tokens is None or not any(
-                token.lower() == "upgrade" for token in self.connection_tokens
-            ):
+            if self.connection_tokens is None or "upgrade" not in [
+                token.lower() for token in self.connection_tokens
+            ]:
                 return False
             if self.upgrade.lower() != b"websocket":
                 return False
@@ -107,20 +129,19 @@ class Handshake:
             else:
                 headers.append((b"sec-websocket-protocol", subprotocol.encode()))
 
-        extensions: List[Extension] = [PerMessageDeflate()]
-        accepts = None
+        extensions: List[Extension] = []
         if self.extensions is not None:
+            extensions.append(PerMessageDeflate())
             accepts = server_extensions_handshake(self.extensions, extensions)
-
-        if accepts:
-            headers.append((b"sec-websocket-extensions", accepts))
+            if accepts:
+                headers.append((b"sec-websocket-extensions", accepts))
 
         if self.key is not None:
             headers.append((b"sec-websocket-accept", generate_accept_token(self.key)))
 
         status_code = 200
         if self.http_version == "1.1":
-            headers.extend([(b"upgrade", b"WebSocket"), (b"connection", b"Upgrade")])
+            headers.extend(_UPGRADE_HEADERS)
             status_code = 101
 
         for name, value in additional_headers:
@@ -133,6 +154,8 @@ class Handshake:
 
 
 class WebsocketBuffer:
+    __slots__ = ("length", "max_length", "value")
+
     def __init__(self, max_length: int) -> None:
         self.value: Optional[Union[BytesIO, StringIO]] = None
         self.length = 0
@@ -144,9 +167,10 @@ class WebsocketBuffer:
                 self.value = StringIO()
             else:
                 self.value = BytesIO()
-        self.length += self.value.write(event.data)
+        self.length += len(event.data)
         if self.length > self.max_length:
             raise FrameTooLargeError()
+        self.value.write(event.data)
 
     def clear(self) -> None:
         self.value = None
@@ -160,6 +184,10 @@ class WebsocketBuffer:
         }
 
 
+_AppHandler = Callable[["WSStream", ASGISendEvent], Awaitable[None]]
+_EventHandler = Callable[["WSStream", WSProtoEvent], Awaitable[None]]
+
+
 class WSStream:
     def __init__(
         self,
@@ -202,7 +230,7 @@ class WSStream:
         if self.closed:
             return
         elif isinstance(event, Request):
-            self.start_time = time()
+            self.start_time = monotonic()
             self.handshake = Handshake(event.headers, event.http_version)
             path, _, query_string = event.raw_path.partition(b"?")
             self.scope = {
@@ -233,8 +261,7 @@ class WSStream:
                 )
                 await self.app_put({"type": "websocket.connect"})
         elif isinstance(event, (Body, Data)):
-            self.connection.receive_data(event.data)
-            await self._handle_events()
+            await self._handle_data(event.data)
         elif isinstance(event, StreamClosed):
             self.closed = True
             if self.app_put is not None:
@@ -253,84 +280,65 @@ class WSStream:
             # Cleanup if required
             if self.state == ASGIWebsocketState.HANDSHAKE:
                 await self._send_error_response(500)
-                await self.config.log.access(
-                    self.scope, {"status": 500, "headers": []}, time() - self.start_time
-                )
             elif self.state == ASGIWebsocketState.CONNECTED:
                 await self._send_wsproto_event(CloseConnection(code=CloseReason.INTERNAL_ERROR))
             await self.send(StreamClosed(stream_id=self.stream_id))
         else:
-            if message["type"] == "websocket.accept" and self.state == ASGIWebsocketState.HANDSHAKE:
-                await self._accept(message)
-            elif (
-                message["type"] == "websocket.http.response.start"
-                and self.state == ASGIWebsocketState.HANDSHAKE
-            ):
-                self.response = message
-            elif message["type"] == "websocket.http.response.body" and self.state in {
-                ASGIWebsocketState.HANDSHAKE,
-                ASGIWebsocketState.RESPONSE,
-            }:
-                await self._send_rejection(message)
-            elif message["type"] == "websocket.send" and self.state == ASGIWebsocketState.CONNECTED:
-                event: WSProtoEvent
-                if message.get("bytes") is not None:
-                    event = BytesMessage(data=bytes(message["bytes"]))
-                elif not isinstance(message["text"], str):
-                    raise TypeError(f"{message['text']} should be a str")
-                else:
-                    event = TextMessage(data=message["text"])
-                await self._send_wsproto_event(event)
-            elif (
-                message["type"] == "websocket.close" and self.state == ASGIWebsocketState.HANDSHAKE
-            ):
-                self.state = ASGIWebsocketState.HTTPCLOSED
-                await self._send_error_response(403)
-            elif message["type"] == "websocket.close":
-                self.state = ASGIWebsocketState.CLOSED
-                await self._send_wsproto_event(
-                    CloseConnection(
-                        code=int(message.get("code", CloseReason.NORMAL_CLOSURE)),
-                        reason=message.get("reason"),
-                    )
-                )
-                await self.send(EndData(stream_id=self.stream_id))
-            else:
+            handler = self._STATE_HANDLERS.get((self.state, message["type"]))
+            if handler is None:
                 raise UnexpectedMessageError(self.state, message["type"])
-
-    async def _handle_events(self) -> None:
-        for event in self.connection.events():
-            if isinstance(event, Message):
+            await handler(self, message)
+
+    async def _handle_data(self, data: bytes) -> None:
+        self.connection.receive_data(data)
+        # Parse all the received frames before awaiting on any of them
+        events = list(self.connection.events())
+        for event in events:
+            handler = self._EVENT_HANDLERS.get(type(event))
+            if handler is not None:
                 try:
-                    self.buffer.extend(event)
+                    await handler(self, event)
                 except FrameTooLargeError:
                     await self._send_wsproto_event(
                         CloseConnection(code=CloseReason.MESSAGE_TOO_BIG)
                     )
                     break
 
-                if event.message_finished:
-                    await self.app_put(self.buffer.to_message())
-                    self.buffer.clear()
-            elif isinstance(event, Ping):
-                await self._send_wsproto_event(event.response())
-            elif isinstance(event, CloseConnection):
-                if self.connection.state == ConnectionState.REMOTE_CLOSING:
-                    await self._send_wsproto_event(event.response())
-                await self.send(StreamClosed(stream_id=self.stream_id))
+    async def _handle_message(self, event: Message) -> None:
+        self.buffer.extend(event)
+        if event.message_finished:
+            await self.app_put(self.buffer.to_message())
+            self.buffer.clear()
+
+    async def _handle_ping(self, event: Ping) -> None:
+        await self._send_wsproto_event(event.response())
+
+    async def _handle_close(self, event: CloseConnection) -> None:
+        if self.connection.state == ConnectionState.REMOTE_CLOSING:
+            await self._send_wsproto_event(event.response())
+        await self.send(StreamClosed(stream_id=self.stream_id))
+
+    # Dispatched on the exact event type, which matches each handler's argument
+    _EVENT_HANDLERS: ClassVar[Dict[Type[WSProtoEvent], _EventHandler]] = cast(
+        Dict[Type[WSProtoEvent], _EventHandler],
+        {
+            BytesMessage: _handle_message,
+            TextMessage: _handle_message,
+            Ping: _handle_ping,
+            CloseConnection: _handle_close,
+        },
+    )
 
     async def _send_error_response(self, status_code: int) -> None:
         await self.send(
             Response(
                 stream_id=self.stream_id,
                 status_code=status_code,
-                headers=[(b"content-length", b"0"), (b"connection", b"close")],
+                headers=list(_ERROR_HEADERS),
             )
         )
         await self.send(EndBody(stream_id=self.stream_id))
-        await self.config.log.access(
-            self.scope, {"status": status_code, "headers": []}, time() - self.start_time
-        )
+        await self._log_access({"status": status_code, "headers": []})
 
     async def _send_wsproto_event(self, event: WSProtoEvent) -> None:
         try:
@@ -348,12 +356,37 @@ class WSStream:
         await self.send(
             Response(stream_id=self.stream_id, status_code=status_code, headers=headers)
         )
-        await self.config.log.access(
-            self.scope, {"status": status_code, "headers": []}, time() - self.start_time
-        )
+        await self._log_access({"status": status_code, "headers": []})
         if self.config.websocket_ping_interval is not None:
             self.task_group.spawn(self._send_pings)
 
+    async def _start_response(self, message: WebsocketResponseStartEvent) -> None:
+        self.response = message
+
+    async def _send_message(self, message: WebsocketSendEvent) -> None:
+        event: WSProtoEvent
+        if message.get("bytes") is not None:
+            event = BytesMessage(data=bytes(message["bytes"]))
+        elif not isinstance(message["text"], str):
+            raise TypeError(f"{message['text']} should be a str")
+        else:
+            event = TextMessage(data=message["text"])
+        await self._send_wsproto_event(event)
+
+    async def _reject(self, message: WebsocketCloseEvent) -> None:
+        self.state = ASGIWebsocketState.HTTPCLOSED
+        await self._send_error_response(403)
+
+    async def _close(self, message: WebsocketCloseEvent) -> None:
+        self.state = ASGIWebsocketState.CLOSED
+        await self._send_wsproto_event(
+            CloseConnection(
+                code=int(message.get("code", CloseReason.NORMAL_CLOSURE)),
+                reason=message.get("reason"),
+            )
+        )
+        await self.send(EndData(stream_id=self.stream_id))
+
     async def _send_rejection(self, message: WebsocketResponseBodyEvent) -> None:
         body_suppressed = suppress_body("GET", self.response["status"])
         if self.state == ASGIWebsocketState.HANDSHAKE:
@@ -371,7 +404,28 @@ class WSStream:
         if not message.get("more_body", False):
             self.state = ASGIWebsocketState.HTTPCLOSED
             await self.send(EndBody(stream_id=self.stream_id))
-            await self.config.log.access(self.scope, self.response, time() - self.start_time)
+            await self._log_access(self.response)
+
+    # Dispatched on the message type, which matches each handler's argument
+    _STATE_HANDLERS: ClassVar[Dict[Tuple[ASGIWebsocketState, str], _AppHandler]] = cast(
+        Dict[Tuple[ASGIWebsocketState, str], _AppHandler],
+        {
+            (ASGIWebsocketState.HANDSHAKE, "websocket.accept"): _accept,
+            (ASGIWebsocketState.HANDSHAKE, "websocket.http.response.start"): _start_response,
+            (ASGIWebsocketState.HANDSHAKE, "websocket.http.response.body"): _send_rejection,
+            (ASGIWebsocketState.RESPONSE, "websocket.http.response.body"): _send_rejection,
+            (ASGIWebsocketState.CONNECTED, "websocket.send"): _send_message,
+            (ASGIWebsocketState.HANDSHAKE, "websocket.close"): _reject,
+            # Close is accepted in any other state
+            (ASGIWebsocketState.CONNECTED, "websocket.close"): _close,
+            (ASGIWebsocketState.RESPONSE, "websocket.close"): _close,
+            (ASGIWebsocketState.CLOSED, "websocket.close"): _close,
+            (ASGIWebsocketState.HTTPCLOSED, "websocket.close"): _close,
+        },
+    )
+
+    async def _log_access(self, response: ResponseSummary) -> None:
+        await self.config.log.access(self.scope, response, monotonic() - self.start_time)
 
     async def _send_pings(self) -> None:
         while not self.closed:
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from typing import List
+
 import trio
 
 from .task_group import TaskGroup
@@ -9,6 +11,7 @@ from ..events import Event, RawData
 from ..typing import AppWrapper
 from ..utils import parse_socket_addr
 
+MAX_BATCH = 32
 MAX_RECV = 2**16
 
 
@@ -24,6 +27,7 @@ class UDPServer:
         self.config = config
         self.context = context
         self.socket = trio.socket.from_stdlib_socket(socket)
+        self._socket = socket  # Non-blocking, as set by trio
 
     async def run(
         self, task_status: trio._core._run._TaskStatus = trio.TASK_STATUS_IGNORED
@@ -37,10 +41,22 @@ class UDPServer:
                 self.app, self.config, self.context, task_group, server, self.protocol_send
             )
 
+            buffer = memoryview(bytearray(MAX_RECV))
             while not self.context.terminated.is_set() or not self.protocol.idle:
-                data, address = await self.socket.recvfrom(MAX_RECV)
-                await self.protocol.handle(RawData(data=data, address=address))
+                await self.protocol.handle_batch(await self._receive_batch(buffer))
 
     async def protocol_send(self, event: Event) -> None:
         if isinstance(event, RawData):
             await self.socket.sendto(event.data, event.address)
+
+    async def _receive_batch(self, buffer: memoryview) -> List[RawData]:
+        nbytes, address = await self.socket.recvfrom_into(buffer)
+        events = [RawData(data=bytes(buffer[:nbytes]), address=address)]
+        # Drain any further datagrams that are already waiting
+        while len(events) < MAX_BATCH:
+            try:
+                nbytes, address = self._socket.recvfrom_into(buffer)
+            except BlockingIOError:
+                break
+            events.append(RawData(data=bytes(buffer[:nbytes]), address=address))
+        return events
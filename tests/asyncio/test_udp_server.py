@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import asyncio
+import socket
+import sys
+from types import ModuleType
+from unittest.mock import Mock
+
+import pytest
+
+from hypercorn.asyncio.udp_server import UDPServer
+from hypercorn.asyncio.worker_context import WorkerContext
+from hypercorn.config import Config
+from hypercorn.events import RawData
+
+try:
+    from unittest.mock import AsyncMock
+except ImportError:
+    # Python < 3.8
+    from mock import AsyncMock  # type: ignore
+
+
+@pytest.mark.asyncio
+async def test_run_handles_queued_datagrams_as_batch(
+    event_loop: asyncio.AbstractEventLoop, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    context = WorkerContext(None)
+    server = UDPServer(AsyncMock(), event_loop, Config(), context)
+
+    async def _handle_batch(events: list) -> None:
+        await context.terminated.set()
+
+    protocol = Mock(idle=True)
+    protocol.handle_batch = AsyncMock(side_effect=_handle_batch)
+    # h3/Quic is optional, so replace the protocol module rather than importing it
+    quic = ModuleType("hypercorn.protocol.quic")
+    quic.QuicProtocol = Mock(return_value=protocol)  # type: ignore
+    monkeypatch.setitem(sys.modules, "hypercorn.protocol.quic", quic)
+
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as udp_socket:
+        udp_socket.bind(("127.0.0.1", 0))
+        server.connection_made(Mock(get_extra_info=Mock(return_value=udp_socket)))
+        for index in range(3):
+            server.datagram_received(b"%d" % index, ("127.0.0.1", 5000))  # type: ignore
+        await server.run()
+
+    protocol.handle_batch.assert_called_once_with(
+        [
+            RawData(data=b"0", address=("127.0.0.1", 5000)),
+            RawData(data=b"1", address=("127.0.0.1", 5000)),
+            RawData(data=b"2", address=("127.0.0.1", 5000)),
+        ]
+    )
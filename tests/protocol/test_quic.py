@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import os
+from unittest.mock import call
+
+import pytest
+import pytest_asyncio
+
+from hypercorn.asyncio.worker_context import WorkerContext
+from hypercorn.config import Config
+from hypercorn.events import RawData
+
+pytest.importorskip("aioquic")
+
+from aioquic.h3.connection import H3_ALPN  # noqa: E402
+from aioquic.quic.configuration import QuicConfiguration  # noqa: E402
+from aioquic.quic.connection import QuicConnection  # noqa: E402
+
+from hypercorn.protocol.quic import QuicProtocol  # noqa: E402
+
+try:
+    from unittest.mock import AsyncMock
+except ImportError:
+    # Python < 3.8
+    from mock import AsyncMock  # type: ignore
+
+ASSETS = os.path.join(os.path.dirname(__file__), "..", "assets")
+
+
+def _client_initial() -> bytes:
+    client = QuicConnection(configuration=QuicConfiguration(alpn_protocols=H3_ALPN, is_client=True))
+    client.connect(("127.0.0.1", 4433), now=0)
+    data, _ = client.datagrams_to_send(now=0)[0]
+    return data
+
+
+@pytest_asyncio.fixture(name="protocol")  # type: ignore[misc]
+async def _protocol() -> QuicProtocol:
+    config = Config()
+    config.certfile = os.path.join(ASSETS, "cert.pem")
+    config.keyfile = os.path.join(ASSETS, "key.pem")
+    protocol = QuicProtocol(
+        AsyncMock(), config, WorkerContext(None), AsyncMock(), ("127.0.0.1", 4433), AsyncMock()
+    )
+    protocol._handle_events = AsyncMock()  # type: ignore
+    return protocol
+
+
+@pytest.mark.asyncio
+async def test_handle_batch_single_connection(protocol: QuicProtocol) -> None:
+    data = _client_initial()
+    await protocol.handle_batch(
+        [
+            RawData(data=data, address=("127.0.0.1", 5000)),
+            RawData(data=data, address=("127.0.0.1", 5001)),
+        ]
+    )
+    connection = next(iter(protocol.connections.values()))
+    assert protocol._handle_events.call_args_list == [  # type: ignore
+        call(connection, ("127.0.0.1", 5001))
+    ]
+
+
+@pytest.mark.asyncio
+async def test_handle_batch_skips_invalid(protocol: QuicProtocol) -> None:
+    data = _client_initial()
+    unsupported_version = data[:1] + b"\x0a\x0a\x0a\x0a" + data[5:]
+    await protocol.handle_batch(
+        [
+            RawData(data=b"", address=("127.0.0.1", 5000)),
+            RawData(data=unsupported_version, address=("127.0.0.1", 5001)),
+            RawData(data=data, address=("127.0.0.1", 5002)),
+        ]
+    )
+    protocol.send.assert_called_once()  # type: ignore
+    assert protocol.send.call_args[0][0].address == ("127.0.0.1", 5001)  # type: ignore
+    connection = next(iter(protocol.connections.values()))
+    assert protocol._handle_events.call_args_list == [  # type: ignore
+        call(connection, ("127.0.0.1", 5002))
+    ]
+
+
+@pytest.mark.asyncio
+async def test_handle(protocol: QuicProtocol) -> None:
+    await protocol.handle(RawData(data=_client_initial(), address=("127.0.0.1", 5000)))
+    connection = next(iter(protocol.connections.values()))
+    assert protocol._handle_events.call_args_list == [  # type: ignore
+        call(connection, ("127.0.0.1", 5000))
+    ]
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import asyncio
+import weakref
 from typing import Any, cast, List, Tuple
 from unittest.mock import call, Mock
 
@@ -162,6 +163,19 @@ def test_handshake_accept_additional_headers() -> None:
     ]
 
 
+def test_handshake_accept_permessage_deflate() -> None:
+    handshake = Handshake(
+        [
+            (b"sec-websocket-version", b"13"),
+            (b"sec-websocket-extensions", b"permessage-deflate"),
+        ],
+        "2",
+    )
+    status_code, headers, _ = handshake.accept(None, [])
+    assert status_code == 200
+    assert headers == [(b"sec-websocket-extensions", b"permessage-deflate")]
+
+
 @pytest_asyncio.fixture(name="stream")  # type: ignore[misc]
 async def _stream() -> WSStream:
     stream = WSStream(
@@ -358,7 +372,7 @@ async def test_send_app_error_handshake(stream: WSStream) -> None:
         call(EndBody(stream_id=1)),
         call(StreamClosed(stream_id=1)),
     ]
-    stream.config._log.access.assert_called()  # type: ignore
+    stream.config._log.access.assert_called_once()  # type: ignore
 
 
 @pytest.mark.asyncio
@@ -406,6 +420,83 @@ async def test_send_connection(stream: WSStream) -> None:
     ]
 
 
+@pytest.mark.asyncio
+async def test_handle_data_replies(stream: WSStream) -> None:
+    await stream.handle(
+        Request(
+            stream_id=1,
+            http_version="2",
+            headers=[(b"sec-websocket-version", b"13")],
+            raw_path=b"/",
+            method="GET",
+        )
+    )
+    await stream.app_send(cast(WebsocketAcceptEvent, {"type": "websocket.accept"}))
+    stream.send.reset_mock()  # type: ignore
+    await stream.handle(
+        Data(stream_id=1, data=b"\x89\x81\xa9\x12\x13\xdf\xc8\x89\x81nB\xcd\x8e\x0c")
+    )
+    assert stream.send.call_args_list == [  # type: ignore
+        call(Data(stream_id=1, data=b"\x8a\x01a")),
+        call(Data(stream_id=1, data=b"\x8a\x01b")),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_handle_data_app_send_ordering(stream: WSStream) -> None:
+    await stream.handle(
+        Request(
+            stream_id=1,
+            http_version="2",
+            headers=[(b"sec-websocket-version", b"13")],
+            raw_path=b"/",
+            method="GET",
+        )
+    )
+    await stream.app_send(cast(WebsocketAcceptEvent, {"type": "websocket.accept"}))
+    stream.send.reset_mock()  # type: ignore
+
+    async def _app_put(message: dict) -> None:
+        await stream.app_send(
+            cast(WebsocketSendEvent, {"type": "websocket.send", "bytes": b"echo"})
+        )
+        await stream.app_send(cast(WebsocketCloseEvent, {"type": "websocket.close"}))
+
+    stream.app_put = _app_put
+    # A ping followed by a text message
+    await stream.handle(
+        Data(stream_id=1, data=b"\x89\x81\xa9\x12\x13\xdf\xc8\x81\x85&`\x13\x0eN\x05\x7fbI")
+    )
+    assert stream.send.call_args_list == [  # type: ignore
+        call(Data(stream_id=1, data=b"\x8a\x01a")),
+        call(Data(stream_id=1, data=b"\x82\x04echo")),
+        call(Data(stream_id=1, data=b"\x88\x02\x03\xe8")),
+        call(EndData(stream_id=1)),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_handle_data_app_error(stream: WSStream) -> None:
+    await stream.handle(
+        Request(
+            stream_id=1,
+            http_version="2",
+            headers=[(b"sec-websocket-version", b"13")],
+            raw_path=b"/",
+            method="GET",
+        )
+    )
+    await stream.app_send(cast(WebsocketAcceptEvent, {"type": "websocket.accept"}))
+    stream.send.reset_mock()  # type: ignore
+    stream.app_put = AsyncMock(side_effect=RuntimeError())
+    with pytest.raises(RuntimeError):
+        await stream.handle(Data(stream_id=1, data=b"\x81\x85&`\x13\x0eN\x05\x7fbI"))
+    await stream.app_send(cast(WebsocketSendEvent, {"type": "websocket.send", "text": "later"}))
+    assert stream.send.call_args_list == [  # type: ignore
+        call(Data(stream_id=1, data=b"\x81\x05later")),
+    ]
+
+
 @pytest.mark.asyncio
 async def test_pings(stream: WSStream, event_loop: asyncio.AbstractEventLoop) -> None:
     stream.config.websocket_ping_interval = 0.1
@@ -494,6 +585,13 @@ def test_stream_idle(stream: WSStream, state: ASGIWebsocketState, idle: bool) ->
     assert stream.idle is idle
 
 
+def test_stream_freed_without_gc() -> None:
+    stream = WSStream(Mock(), Config(), Mock(), Mock(), False, None, None, Mock(), 1)
+    reference = weakref.ref(stream)
+    del stream
+    assert reference() is None
+
+
 @pytest.mark.asyncio
 async def test_closure(stream: WSStream) -> None:
     assert not stream.closed
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import socket
+from typing import Iterator
+
+import pytest
+
+from hypercorn.config import Config
+from hypercorn.events import RawData
+from hypercorn.trio.udp_server import MAX_BATCH, MAX_RECV, UDPServer
+from hypercorn.trio.worker_context import WorkerContext
+
+try:
+    from unittest.mock import AsyncMock
+except ImportError:
+    # Python < 3.8
+    from mock import AsyncMock  # type: ignore
+
+
+@pytest.fixture(name="sockets")
+def _sockets() -> Iterator[tuple]:
+    server = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    server.bind(("127.0.0.1", 0))
+    client = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    client.bind(("127.0.0.1", 0))
+    yield server, client
+    server.close()
+    client.close()
+
+
+@pytest.mark.trio
+async def test_receive_batch_drains_ready(sockets: tuple) -> None:
+    server_socket, client = sockets
+    server = UDPServer(AsyncMock(), Config(), WorkerContext(None), server_socket)
+    for index in range(3):
+        client.sendto(b"%d" % index, server_socket.getsockname())
+    buffer = memoryview(bytearray(MAX_RECV))
+    address = client.getsockname()
+    assert await server._receive_batch(buffer) == [
+        RawData(data=b"0", address=address),
+        RawData(data=b"1", address=address),
+        RawData(data=b"2", address=address),
+    ]
+
+
+@pytest.mark.trio
+async def test_receive_batch_max_batch(sockets: tuple) -> None:
+    server_socket, client = sockets
+    server = UDPServer(AsyncMock(), Config(), WorkerContext(None), server_socket)
+    for index in range(MAX_BATCH + 2):
+        client.sendto(b"%d" % index, server_socket.getsockname())
+    buffer = memoryview(bytearray(MAX_RECV))
+    events = await server._receive_batch(buffer)
+    assert [event.data for event in events] == [b"%d" % index for index in range(MAX_BATCH)]
+    events = await server._receive_batch(buffer)
+    assert [event.data for event in events] == [b"%d" % MAX_BATCH, b"%d" % (MAX_BATCH + 1)]